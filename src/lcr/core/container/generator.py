@@ -1,3 +1,4 @@
+import functools
 import json
 import os
 from pathlib import Path
@@ -7,6 +8,21 @@ from lcr.utils.path_helper import get_resource_path
 TEMPLATE_DIR = get_resource_path("templates")
 IMAGE_DIR = Path(__file__).parent / "images"  # Images are generated artifacts, keep local
 
+# Tag -> filename-safe characters, applied in a single pass
+_SAFE_TAG_TABLE = str.maketrans({"-": "_", ":": "_"})
+
+def safe_tag_name(tag: str) -> str:
+    """Clean an image tag for use in a filename (lcr-py36-ml-classic -> lcr_py36_ml_classic)."""
+    return tag.translate(_SAFE_TAG_TABLE)
+
+@functools.lru_cache(maxsize=1)
+def _get_environment() -> Environment:
+    """
+    Shared Jinja environment for all generate_dockerfile calls.
+    Its template cache re-reads a template only when the file's mtime changes.
+    """
+    return Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)))
+
 def generate_dockerfile(config_path: str, output_dir: str = str(IMAGE_DIR)):
     """
     Generate a Dockerfile from a JSON definition using the base template.
@@ -31,8 +47,7 @@ def generate_dockerfile(config_path: str, output_dir: str = str(IMAGE_DIR)):
     }
     
     # Load Template
-    env = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)))
-    template = env.get_template("base.Dockerfile.j2")
+    template = _get_environment().get_template("base.Dockerfile.j2")
     
     rendered = template.render(context)
     
@@ -46,7 +61,7 @@ def generate_dockerfile(config_path: str, output_dir: str = str(IMAGE_DIR)):
     # But usually build_images.py maps tags manually. 
     # We will output the file and return the filename + tag so the caller can update build mappings.
     
-    safe_tag = tag.replace("-", "_").replace(":", "_")
+    safe_tag = safe_tag_name(tag)
     filename = f"Dockerfile.{safe_tag}"
     output_path = Path(output_dir) / filename
     
@@ -12,10 +12,73 @@ This module provides ContainerManager which:
 """
 
 from typing import Dict, Optional, List
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+import datetime
+import functools
+import os
+import shutil
 import subprocess
+import sys
 
 from .types import ImageRule, RunConfig, AnalysisResult
+from lcr.utils.path_helper import dir_contains_any
+
+# Standard library modules never need a pip install.
+# Host names (3.10+) plus Python 2-only modules that show up in legacy scripts.
+_PY2_ONLY_STDLIB = frozenset({
+    '__builtin__', 'anydbm', 'commands', 'ConfigParser', 'cookielib', 'copy_reg',
+    'cPickle', 'cStringIO', 'dummy_thread', 'exceptions', 'htmlentitydefs',
+    'HTMLParser', 'httplib', 'md5', 'Queue', 'sets', 'sha', 'SocketServer',
+    'StringIO', 'thread', 'Tkinter', 'tkMessageBox', 'urllib2', 'urlparse', 'xmlrpclib',
+})
+_STDLIB_NAMES = frozenset(sys.stdlib_module_names) | _PY2_ONLY_STDLIB
+
+_IS_MAC = sys.platform == 'darwin'
+
+_PROJECT_ROOT_SENTINELS = frozenset({"run_gui.py", ".git"})
+
+@functools.lru_cache(maxsize=1)
+def _default_project_root() -> Path:
+    """
+    Project root used for default result folders.
+    The install layout does not change while running, so the probes run once per process.
+    """
+    # Inferred Project Root: 4 levels up
+    project_root = Path(__file__).resolve().parents[4]
+    
+    # Fallback if project root seems wrong
+    if not dir_contains_any(project_root, _PROJECT_ROOT_SENTINELS):
+        project_root = Path.cwd()
+    return project_root
+
+# Linux FICLONE ioctl: copy-on-write clone of a whole file (btrfs, XFS with reflink)
+_FICLONE = 0x40049409
+
+def _snapshot_file(src: str, dst: Path) -> None:
+    """
+    Copy the script for the audit snapshot.
+    Tries an O(1) copy-on-write clone first, then a regular content copy.
+    A hardlink is deliberately not used: the GUI rewrites the script in place,
+    which would silently change a linked snapshot as well.
+    """
+    if sys.platform.startswith('linux'):
+        import fcntl
+        try:
+            with open(src, 'rb') as src_f, open(dst, 'wb') as dst_f:
+                fcntl.ioctl(dst_f.fileno(), _FICLONE, src_f.fileno())
+            return
+        except OSError:
+            pass  # No reflink support (ext4, tmpfs, cross-device): copy instead
+    # Content only: copyfile uses the kernel fast path (sendfile/fcopyfile) and
+    # skips copy2's extra stat/utime/chmod, which carry no audit value here
+    shutil.copyfile(src, dst)
+
+def _report_snapshot_failure(future: Future) -> None:
+    """Non-blocking failure: Log warning but proceed with execution."""
+    e = future.exception()
+    if e is not None:
+        print(f"[Warning] Failed to create source snapshot: {e}")
 
 class DockerUnavailableError(Exception):
     """Raised when Docker daemon is not reachable."""
@@ -33,49 +96,62 @@ class ContainerManager:
     # Evaluated in order, or by scoring.
     IMAGE_RULES: List[ImageRule] = [
         # Python 2.7 rules
-        {
-            "id": "py27-cv2",
-            "name": "Python 2.7 + OpenCV 2.x",
-            "version": "2.7", 
-            "libs": ["cv2", "opencv", "numpy"], 
-            "image": "lcr-py27-cv-apt", 
-            "prepend_python": False,
-            "triggers": ["cv2.cv", "cv2.bgsegm"] # Triggers for specific runtime
-        },
-        {
-            "id": "py27-slim",
-            "name": "Python 2.7 (Slim)",
-            "version": "2.7", 
-            "libs": [], 
-            "image": "python:2.7-slim", 
-            "prepend_python": True,
-            "triggers": []
-        },
+        ImageRule(
+            id="py27-cv2",
+            name="Python 2.7 + OpenCV 2.x",
+            version="2.7",
+            libs=["cv2", "opencv", "numpy"],
+            image="lcr-py27-cv-apt",
+            prepend_python=False,
+            triggers=["cv2.cv", "cv2.bgsegm"] # Triggers for specific runtime
+        ),
+        ImageRule(
+            id="py27-slim",
+            name="Python 2.7 (Slim)",
+            version="2.7",
+            libs=[],
+            image="python:2.7-slim",
+            prepend_python=True,
+            triggers=[]
+        ),
         
         # Python 3.x rules
-        {
-            "id": "py36-ds",
-            "name": "Python 3.6 Data Science",
-            "version": "3.x", 
-            "libs": ["sklearn", "pandas", "numpy"], 
-            "image": "lcr-py36-ml-classic", 
-            "prepend_python": False, # LCR images have ENTRYPOINT ["python"]
-            "triggers": ["sklearn", "pandas"]
-        },
-        {
-            "id": "py310-slim",
-            "name": "Python 3.10 (Latest)",
-            "version": "3.x", 
-            "libs": [], 
-            "image": "python:3.10-slim", 
-            "prepend_python": True,
-            "triggers": []
-        }
+        ImageRule(
+            id="py36-ds",
+            name="Python 3.6 Data Science",
+            version="3.x",
+            libs=["sklearn", "pandas", "numpy"],
+            image="lcr-py36-ml-classic",
+            prepend_python=False, # LCR images have ENTRYPOINT ["python"]
+            triggers=["sklearn", "pandas"]
+        ),
+        ImageRule(
+            id="py310-slim",
+            name="Python 3.10 (Latest)",
+            version="3.x",
+            libs=[],
+            image="python:3.10-slim",
+            prepend_python=True,
+            triggers=[]
+        )
     ]
     
-    def __init__(self):
-        """Initialize the ContainerManager."""
-        pass
+    def __init__(self, snapshot_source: bool = True):
+        """
+        Initialize the ContainerManager.
+        
+        Args:
+            snapshot_source: Copy each script to source_snapshot.py in its results folder.
+        """
+        self.snapshot_source = snapshot_source
+        # Snapshots are written in the background so 'docker run' is not held up by disk I/O
+        self._snapshot_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Rule chosen when there are no search terms and no version hint.
+        # It only depends on IMAGE_RULES, so it is scored once on first use.
+        self._no_signal_rule: Optional[ImageRule] = None
+        # Per-rule (libs, triggers, libs | triggers) frozensets, built once on first scoring
+        self._rule_sets: Optional[List[tuple]] = None
     
     def validate_environment(self):
         """
@@ -99,27 +175,40 @@ class ContainerManager:
         Resolve best runtime based on search terms (keywords/libs) and version.
         Replaces 'select_image' with more robust matching.
         """
-        best_rule = self.IMAGE_RULES[-1] # Default to latest 3.x
-        best_score = -999
-        
         # Search Terms Set
         terms_set = set(search_terms)
 
-        for rule in self.IMAGE_RULES:
+        # No signals (e.g. manual runs): the outcome is deterministic
+        if not terms_set and version_hint == 'unknown':
+            if self._no_signal_rule is None:
+                self._no_signal_rule = self._score_rules(terms_set, version_hint)
+            return self._no_signal_rule
+
+        return self._score_rules(terms_set, version_hint)
+
+    def _score_rules(self, terms_set: set, version_hint: str) -> ImageRule:
+        """Score every rule against the search terms and return the best one."""
+        best_rule = self.IMAGE_RULES[-1] # Default to latest 3.x
+        best_score = -999
+
+        if self._rule_sets is None:
+            self._rule_sets = [
+                (rule, frozenset(rule.libs), frozenset(rule.triggers),
+                 frozenset(rule.libs).union(rule.triggers))
+                for rule in self.IMAGE_RULES
+            ]
+
+        for rule, rule_libs, rule_triggers, all_criteria in self._rule_sets:
             # 1. Version Compatibility
-            if not self._check_version_compat(version_hint, rule['version']):
+            if not self._check_version_compat(version_hint, rule.version):
                 continue
                 
             # 2. Score Calculation
             score = 0
-            if rule['version'] == version_hint:
+            if rule.version == version_hint:
                 score += 50
             
             # Library/Keyword Matching
-            rule_libs = set(rule.get('libs', []))
-            rule_triggers = set(rule.get('triggers', []))
-            all_criteria = rule_libs.union(rule_triggers)
-            
             if all_criteria:
                 matched = all_criteria.intersection(terms_set)
                 missing = rule_libs - terms_set # Only penalize missing 'required' libs
@@ -128,7 +217,7 @@ class ContainerManager:
                 score -= len(missing) * 10
                 
                 # Bonus for trigger match
-                if rule_triggers.intersection(terms_set):
+                if not rule_triggers.isdisjoint(terms_set):
                     score += 30
             
             if score > best_score:
@@ -165,24 +254,24 @@ class ContainerManager:
         """
         Prepare Docker run configuration with separate input/output mounts.
         """
-        import datetime
-        
         # Select image rule
         rule = self.select_image(analysis_result)
-        image = rule['image']
+        image = rule.image
         
         # Logic to check if we should prepend python
         # 1. Use explicit rule setting if present
         # 2. If valid LCR image (constructed via template), ENTRYPOINT is python, so don't prepend
-        if 'prepend_python' in rule:
-            prepend_python = rule['prepend_python']
+        if rule.prepend_python is not None:
+            prepend_python = rule.prepend_python
         else:
             # Auto-detection: If image starts with 'lcr-', assume it has ENTRYPOINT ["python"]
             prepend_python = not image.startswith('lcr-')
         
-        # Determine paths
-        script_path_obj = Path(script_path).resolve()
-        if not script_path_obj.exists():
+        # Determine paths (realpath + a single stat instead of resolve() + exists())
+        script_path_obj = Path(os.path.realpath(script_path))
+        try:
+            os.stat(script_path_obj)
+        except OSError:
             raise FileNotFoundError(f"Script not found: {script_path}")
         
         # 1. Host Input Directory (Source for Script) -> /app/input (RO)
@@ -210,14 +299,7 @@ class ContainerManager:
             host_output_dir = base_output_path / sub_dir_name
         else:
             # Default logic: {ProjectRoot}/data/results/{YYYYMMDD_HHMMSS}
-            # Inferred Project Root: 4 levels up
-            project_root = Path(__file__).resolve().parents[4]
-            
-            # Fallback if project root seems wrong
-            if not (project_root / "run_gui.py").exists() and not (project_root / ".git").exists():
-                 project_root = Path.cwd()
-            
-            host_output_dir = project_root / "data" / "results" / timestamp
+            host_output_dir = _default_project_root() / "data" / "results" / timestamp
         
         # Create output directory
         host_output_dir.mkdir(parents=True, exist_ok=True)
@@ -225,13 +307,14 @@ class ContainerManager:
         # --- SNAPSHOT SAFETY FEATURE ---
         # Copy the source script to the output directory as 'source_snapshot.py'.
         # This ensures auditability even if the original script is modified later.
-        try:
-            import shutil
+        # The copy runs on a background thread; the future is returned in the config.
+        snapshot_future = None
+        if self.snapshot_source:
+            if self._snapshot_pool is None:
+                self._snapshot_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lcr-snapshot")
             snapshot_path = host_output_dir / "source_snapshot.py"
-            shutil.copy2(script_path, snapshot_path)
-        except Exception as e:
-            # Non-blocking failure: Log warning but proceed with execution
-            print(f"[Warning] Failed to create source snapshot: {e}")
+            snapshot_future = self._snapshot_pool.submit(_snapshot_file, script_path, snapshot_path)
+            snapshot_future.add_done_callback(_report_snapshot_failure)
         # -------------------------------
         
         # Container Paths
@@ -244,22 +327,25 @@ class ContainerManager:
             # Script Input (Read-only)
             str(host_input_dir): {
                 'bind': container_input_dir,
-                'mode': 'ro' 
+                'mode': 'ro',
+                'consistency': 'cached'  # Host copy is authoritative
             },
             # Result Output (Read-write)
             str(host_output_dir): {
                 'bind': container_output_dir,
-                'mode': 'rw'
+                'mode': 'rw',
+                'consistency': 'delegated'  # Host only reads results after the run
             }
         }
         
         # Add optional data volume if provided (e.g., large datasets)
         if data_dir:
-            host_data_dir = Path(data_dir).resolve()
-            if host_data_dir.exists():
+            host_data_dir = Path(os.path.realpath(data_dir))
+            if os.path.exists(host_data_dir):
                 volumes[str(host_data_dir)] = {
                     'bind': '/data',
-                    'mode': 'ro' 
+                    'mode': 'ro',
+                    'consistency': 'cached'
                 }
         
         # Build configuration
@@ -278,6 +364,8 @@ class ContainerManager:
             'script_name': script_name,
             'host_work_dir': str(host_output_dir), # Reported host work dir matches output
         }
+        if snapshot_future is not None:
+            config['snapshot_future'] = snapshot_future
         
         return config
     
@@ -297,6 +385,10 @@ class ContainerManager:
         for host_path, mount_config in config['volumes'].items():
             bind_path = mount_config['bind']
             mode = mount_config.get('mode', 'rw')
+            # Consistency hints only matter for osxfs-backed mounts on Docker Desktop for Mac
+            consistency = mount_config.get('consistency') if _IS_MAC else None
+            if consistency:
+                mode = f'{mode},{consistency}'
             args.extend(['-v', f'{host_path}:{bind_path}:{mode}'])
         
         # Add working directory
@@ -332,9 +424,12 @@ class ContainerManager:
         if not libraries:
             return None
         
-        # Filter out standard library modules
-        # This is a simplified approach - could be enhanced with stdlib detection
-        external_libs = [lib for lib in libraries if lib not in ['sys', 'os', 're', 'json']]
+        # Filter out standard library modules, plus private/one-letter names
+        # (local helpers) that pip would only spend a failed index lookup on
+        external_libs = [
+            lib for lib in libraries
+            if lib not in _STDLIB_NAMES and len(lib) > 1 and not lib.startswith('_')
+        ]
         
         if not external_libs:
             return None
@@ -1,20 +1,26 @@
 from typing import List, Dict, Optional, TypedDict
 from dataclasses import dataclass, field
+from concurrent.futures import Future
+from lcr.utils.key_access import KeyAccessMixin
 
-class ImageRule(TypedDict):
+@dataclass(slots=True)
+class ImageRule(KeyAccessMixin):
     id: str
     name: str
     version: str
-    libs: List[str]
     image: str
-    prepend_python: bool
-    triggers: List[str]
+    libs: List[str] = field(default_factory=list)
+    triggers: List[str] = field(default_factory=list)
+    prepend_python: Optional[bool] = None # None -> auto-detect from image name
 
-class VolumeConfig(TypedDict):
+class _VolumeConfigBase(TypedDict):
     bind: str
     mode: str
 
-class RunConfig(TypedDict):
+class VolumeConfig(_VolumeConfigBase, total=False):
+    consistency: str  # Bind-mount hint for Docker Desktop on macOS: cached / delegated
+
+class _RunConfigBase(TypedDict):
     image: str
     volumes: Dict[str, VolumeConfig]
     working_dir: str
@@ -22,6 +28,9 @@ class RunConfig(TypedDict):
     script_name: str
     host_work_dir: str
 
+class RunConfig(_RunConfigBase, total=False):
+    snapshot_future: Future  # Pending source_snapshot.py copy (None result on success)
+
 @dataclass
 class CodeFeature:
     """Mirrors the definition in analyzer.py for type hinting."""
@@ -12,6 +12,10 @@ This module provides ContainerWorker which:
 - Based on LCR's TrainingWorker pattern
 """
 
+import codecs
+import io
+import os
+import selectors
 import subprocess
 from pathlib import Path
 from typing import Optional
@@ -26,11 +30,16 @@ class ContainerWorker(QThread):
     in Docker containers with real-time output streaming.
     
     Signals:
-        output_ready(str): Emitted when new output line is available
+        log_updated(str): Emitted with one or more new output lines (newline-joined)
         error_occurred(str): Emitted when an error occurs
         finished_with_code(int): Emitted when execution completes with exit code
     """
     
+    # Max bytes pulled from the container pipe per read
+    READ_CHUNK_SIZE = 65536
+    # How often a silent container is checked for a stop request (seconds, ~30 Hz)
+    STOP_POLL_INTERVAL = 0.033
+    
     # Signals
     log_updated = Signal(str)
     error_occurred = Signal(str)
@@ -59,43 +68,73 @@ class ContainerWorker(QThread):
     def run(self):
         """Execute the Docker container (runs in background thread)."""
         try:
-            self.log_updated.emit("=" * 70)
-            self.log_updated.emit(f"Starting container execution: {self.script_name}")
-            self.log_updated.emit("=" * 70)
-            self.log_updated.emit(f"Command: {' '.join(self.docker_args)}")
-            self.log_updated.emit("")
+            # Banner blocks go out as one signal each (newline-joined, like streamed output)
+            rule = "=" * 70
+            self.log_updated.emit("\n".join([
+                rule,
+                f"Starting container execution: {self.script_name}",
+                rule,
+                f"Command: {' '.join(self.docker_args)}",
+                "",
+            ]))
             
-            # Start Docker process
+            # Start Docker process (raw byte pipe, decoded in chunks below)
             self.process = subprocess.Popen(
                 self.docker_args,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                encoding='utf-8',
-                bufsize=1,
-                universal_newlines=True
+                bufsize=0
             )
             
-            # Stream output line by line
-            for line in iter(self.process.stdout.readline, ''):
-                if self._stop_requested:
-                    self.log_updated.emit("\n[Execution stopped by user]")
-                    break
-                
-                if line:
-                    self.log_updated.emit(line.rstrip())
+            # Stream output in blocks: one signal per read instead of per line.
+            # Hold the pipe object itself: stop() may drop self.process from the GUI
+            # thread, and the fd must stay open until this loop is done with it.
+            stdout = self.process.stdout
+            fd = stdout.fileno()
+            decoder = io.IncrementalNewlineDecoder(
+                codecs.getincrementaldecoder('utf-8')(errors='replace'), translate=True
+            )
+            # Pipes cannot be selected on Windows; there reads simply block
+            selector = None
+            if os.name != 'nt':
+                selector = selectors.DefaultSelector()
+                selector.register(stdout, selectors.EVENT_READ)
+            pending = ''
+            try:
+                while True:
+                    if self._stop_requested:
+                        self.log_updated.emit("\n[Execution stopped by user]")
+                        break
+                    
+                    if selector is not None and not selector.select(self.STOP_POLL_INTERVAL):
+                        continue  # No output yet; re-check the stop flag
+                    
+                    chunk = os.read(fd, self.READ_CHUNK_SIZE)
+                    if not chunk:
+                        # EOF: flush whatever the decoder still holds
+                        pending += decoder.decode(b'', final=True)
+                        if pending:
+                            self.log_updated.emit(pending.rstrip())
+                        break
+                    
+                    pending += decoder.decode(chunk)
+                    lines = pending.split('\n')
+                    pending = lines.pop()  # Incomplete trailing line
+                    if lines:
+                        self.log_updated.emit('\n'.join(line.rstrip() for line in lines))
+            finally:
+                if selector is not None:
+                    selector.close()
             
             # Wait for process to complete
             if not self._stop_requested:
                 returncode = self.process.wait()
                 
-                self.log_updated.emit("")
-                self.log_updated.emit("=" * 70)
                 if returncode == 0:
-                    self.log_updated.emit(f"Container execution completed successfully (exit code: {returncode})")
+                    status = f"Container execution completed successfully (exit code: {returncode})"
                 else:
-                    self.log_updated.emit(f"Container execution failed (exit code: {returncode})")
-                self.log_updated.emit("=" * 70)
+                    status = f"Container execution failed (exit code: {returncode})"
+                self.log_updated.emit("\n".join(["", rule, status, rule]))
                 
                 self.finished_with_code.emit(returncode)
             else:
@@ -8,9 +8,20 @@ This module provides the CodeAnalyzer class which can:
 """
 
 import ast
+import hashlib
+import mmap
+import os
 import re
-from typing import List, Dict, Optional
-from dataclasses import dataclass, field
+import sys
+from collections import OrderedDict, deque
+from typing import List, Dict, Optional, Set, Tuple
+from dataclasses import dataclass, field, replace
+
+try:
+    # Optional linear-time (DFA) engine for scanning untrusted source text
+    import re2 as _scan_re
+except ImportError:
+    _scan_re = re
 
 
 @dataclass
@@ -21,129 +32,257 @@ class CodeFeature:
     version_hint: str = "unknown" # Kept for existing logic compat
 
 
+class _ImportCollector(ast.NodeVisitor):
+    """
+    Collects imported top-level packages (deduplicated) and keyword attributes in one traversal.
+    Import nodes are not descended into; their alias children carry nothing else.
+    Package names are interned, so results for many files share one string each.
+    With collect_keywords=False only statement nodes are walked, since imports
+    never appear inside expressions.
+    The walk is breadth-first from an explicit queue (the order ast.walk uses),
+    so deeply nested expressions cannot exhaust the recursion limit.
+    """
+
+    # Specific keyword detection
+    KEYWORD_ATTRS = frozenset({'grid_search', 'cross_validation'})
+
+    # Nodes that can hold statement bodies (and therefore imports)
+    _STMT_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+    # Very common nodes with nothing below them worth visiting
+    _LEAF_NODES = (ast.Name, ast.Constant, ast.Load, ast.Store, ast.Del)
+
+    def __init__(self, collect_keywords: bool = True):
+        self.imports: Set[str] = set()
+        self.keywords: List[str] = []
+        # Which child nodes get queued when a node has no handler of its own
+        self._child_type = ast.AST if collect_keywords else self._STMT_NODES
+        # Exact node type -> pre-bound handler; replaces NodeVisitor's
+        # per-node 'visit_' + name string build and getattr.
+        # A handler returns the children still to be walked (None for none).
+        self._handlers = dict.fromkeys(self._LEAF_NODES, self._skip)
+        self._handlers.update({
+            ast.Import: self.visit_Import,
+            ast.ImportFrom: self.visit_ImportFrom,
+            ast.Attribute: self.visit_Attribute,
+        })
+
+    def visit(self, node: ast.AST):
+        handlers = self._handlers
+        child_type = self._child_type
+        queue = deque([node])
+        popleft, append = queue.popleft, queue.append
+        while queue:
+            node = popleft()
+            handler = handlers.get(type(node))
+            if handler is not None:
+                children = handler(node)
+                if children:
+                    queue.extend(children)
+                continue
+            for name in node._fields:
+                value = getattr(node, name, None)
+                if type(value) is list:
+                    for item in value:
+                        if isinstance(item, child_type):
+                            append(item)
+                elif isinstance(value, child_type):
+                    append(value)
+
+    def _skip(self, node: ast.AST):
+        return None
+
+    def visit_Import(self, node: ast.Import):
+        add = self.imports.add
+        for alias in node.names:
+            add(sys.intern(alias.name.partition('.')[0]))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        module = node.module
+        if module:
+            self.imports.add(sys.intern(module.partition('.')[0]))
+
+    def visit_Attribute(self, node: ast.Attribute):
+        if node.attr in self.KEYWORD_ATTRS:
+            self.keywords.append(f"attr:{node.attr}")
+        # Only the value can hold further attributes (ctx is a leaf)
+        return (node.value,)
+
+
 class CodeAnalyzer:
     """
     Analyzes Python code to estimate its version and dependencies.
     """
     
-    # Python 2 specific patterns (extensible rule-based design)
+    # Python 2 specific patterns (extensible rule-based design).
+    # Each entry is (literal, pattern): the pattern only runs when its literal
+    # occurs in the text, so every pattern must contain its literal verbatim.
     PY2_PATTERNS = [
-        r'print\s+["\']',  # print without parentheses
-        r'except\s+\w+\s*,\s*\w+:',  # except Exception, e:
-        r'raise\s+\w+\s*,',  # raise Exception, message
-        r'exec\s+["\']',  # exec statement (not function)
-        r'<>\s*',  # <> operator
-        r'`.*`',  # backtick repr
-        r'#\s*-\*-\s*coding:\s*utf-8\s*-\*-', # Encoding declaration (common in py2)
+        ('print', r'print\s+["\']'),  # print without parentheses
+        ('except', r'except\s+\w+\s*,\s*\w+:'),  # except Exception, e:
+        ('raise', r'raise\s+\w+\s*,'),  # raise Exception, message
+        ('exec', r'exec\s+["\']'),  # exec statement (not function)
+        ('<>', r'<>\s*'),  # <> operator
+        ('`', r'`[^`\n]*`'),  # backtick repr (same hits as `.*`, but DFA-friendly)
+        ('coding', r'#\s*-\*-\s*coding:\s*utf-8\s*-\*-'), # Encoding declaration (common in py2)
     ]
+
+    # Compiled once at class definition (see _scan_source)
+    _PY2_CHECKS = tuple(
+        (literal, _scan_re.compile(pattern)) for literal, pattern in PY2_PATTERNS
+    )
+
+    # Validation year (e.g. "Validated 2015")
+    YEAR_PATTERN = r'20[1-2][0-9]'
+    _YEAR_RE = _scan_re.compile(YEAR_PATTERN)
+    _EXCEPT_COMMA_RE = re.compile(r'except\s+\w+\s*,\s*\w+:')
+
+    # Fallback import extraction; [^\S\n] keeps each match on a single line
+    _IMPORT_RE = re.compile(r'^[^\S\n]*import[^\S\n]+([a-zA-Z_][a-zA-Z0-9_]*)', re.MULTILINE)
+    _FROM_RE = re.compile(r'^[^\S\n]*from[^\S\n]+([a-zA-Z_][a-zA-Z0-9_]*)[^\S\n]+import', re.MULTILINE)
+
+    # Memoized analyze() results keyed by source digest (shared across instances)
+    FEATURE_CACHE_SIZE = 64
+    _feature_cache: "OrderedDict[bytes, CodeFeature]" = OrderedDict()
     
     def __init__(self, code_text=None):
         """Initialize the CodeAnalyzer."""
-        self.py2_pattern = re.compile('|'.join(self.PY2_PATTERNS))
         # Initial code text if provided (User request style)
         self.code = code_text
-        self.tree = None
-        if code_text:
-            try:
-                self.tree = ast.parse(code_text)
-            except SyntaxError:
-                self.tree = None
+        # Last parsed text with its tree / parse error; parsing waits until a tree is needed
+        self._tree: Optional[ast.AST] = None
+        self._parsed_code = None
+        self._parse_error: Optional[str] = None
+
+    @property
+    def tree(self) -> Optional[ast.AST]:
+        """AST of self.code, parsed on first access (None if it does not parse)."""
+        if not self.code:
+            return None
+        return self._parse(self.code)
     
     def analyze(self, code_text=None) -> CodeFeature:
         """
         Perform analysis returning a structured CodeFeature object.
         Compatible with user Request 2.1.
         """
-        # Update internal state if new code provided
+        # Update internal state if new code provided (parsed lazily on cache miss)
         if code_text:
             self.code = code_text
-            try:
-                self.tree = ast.parse(code_text)
-            except SyntaxError:
-                self.tree = None
-        
-        feature = CodeFeature()
         
         if not self.code:
-            return feature
+            return CodeFeature()
+
+        # Identical sources (GUI re-analysis, summary + analyze) reuse one result
+        key = hashlib.blake2b(self.code.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        cache = CodeAnalyzer._feature_cache
+        feature = cache.get(key)
+        if feature is None:
+            feature = self._build_feature()
+            cache[key] = feature
+            if len(cache) > self.FEATURE_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+
+        # Hand out a copy so callers cannot mutate the cached lists
+        return replace(feature, imports=list(feature.imports), keywords=list(feature.keywords))
 
-        # 1. Validation Year Extraction
-        years = re.findall(r'20[1-2][0-9]', self.code)
-        if years:
-            feature.validation_year = min(years)
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Drop all memoized analysis results."""
+        cls._feature_cache.clear()
+
+    def _build_feature(self) -> CodeFeature:
+        """Run the full analysis on self.code (and its lazily parsed tree)."""
+        feature = CodeFeature()
+
+        # 1. Marker Scan (years + PY2/PY3 signatures in one pass)
+        has_py2, feature.validation_year = self._scan_source(self.code)
 
         # 2. Version Detection (Legacy Logic Integration)
-        feature.version_hint = self.analyze_version(self.code)
+        feature.version_hint = self._classify_version(self.code, has_py2)
 
         # 3. Import & Keyword Extraction
-        if self.tree:
-            for node in ast.walk(self.tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        feature.imports.append(alias.name.split('.')[0])
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        feature.imports.append(node.module.split('.')[0])
-                # Specific keyword detection
-                elif isinstance(node, ast.Attribute):
-                    if node.attr in ['grid_search', 'cross_validation']:
-                        feature.keywords.append(f"attr:{node.attr}")
+        tree = self.tree
+        if tree:
+            # Expression subtrees only matter if a keyword appears in the text at all
+            collect_keywords = any(kw in self.code for kw in _ImportCollector.KEYWORD_ATTRS)
+            collector = _ImportCollector(collect_keywords)
+            collector.visit(tree)
+            imports = collector.imports
+            feature.keywords = collector.keywords
         else:
             # Fallback for Python 2 code that fails AST parsing
-            feature.imports = list(self._extract_imports_regex(self.code))
+            imports = self._extract_imports_regex(self.code)
             
-        # Deduplicate
-        feature.imports = sorted(list(set(feature.imports)))
+        # Both paths collect into a set, so sorting is all that is left
+        feature.imports = sorted(imports)
         
         return feature
 
     def analyze_version(self, code_text: str) -> str:
         """Analyze code to determine if it's Python 2 or Python 3."""
+        if not code_text or not code_text.strip():
+            return "unknown"
+        has_py2, _ = self._scan_source(code_text, want_year=False)
+        return self._classify_version(code_text, has_py2)
+
+    def _classify_version(self, code_text: str, has_py2: bool) -> str:
+        """Decide the version from scan results, falling back to the parser."""
         if not code_text or not code_text.strip():
             return "unknown"
         
         # Regex-detectable Python 2 patterns
-        if self.py2_pattern.search(code_text):
+        if has_py2:
             return "2.7"
         
-        # Try parsers
-        try:
-            ast.parse(code_text)
-            if self._has_py3_features(code_text):
-                return "3.x"
+        # Try parsers (reuses the tree when analyze() already parsed this text)
+        if self._parse(code_text) is not None:
             return "3.x"
-        except SyntaxError as e:
-            error_msg = str(e)
-            if "Missing parentheses in call to 'print'" in error_msg:
+        
+        error_msg = self._parse_error or ""
+        if "Missing parentheses in call to 'print'" in error_msg:
+            return "2.7"
+        if "invalid syntax" in error_msg and "except" in code_text:
+             if self._EXCEPT_COMMA_RE.search(code_text):
                 return "2.7"
-            if "invalid syntax" in error_msg and "except" in code_text:
-                 if re.search(r'except\s+\w+\s*,\s*\w+:', code_text):
-                    return "2.7"
-            return "unknown"
-        except Exception:
-            return "unknown"
+        return "unknown"
 
-    def _has_py3_features(self, code_text: str) -> bool:
-        """Check for Python 3 specific features."""
-        py3_patterns = [
-            r'print\s*\(', r'async\s+def', r'await\s+', 
-            r':\s*->\s*', r'@\w+\.setter', r'nonlocal\s+', r'yield\s+from'
-        ]
-        return bool(re.search('|'.join(py3_patterns), code_text))
+    def _parse(self, code_text: str) -> Optional[ast.AST]:
+        """Parse code_text, reusing the result when it is the text parsed last time."""
+        if code_text != self._parsed_code:
+            try:
+                self._tree = ast.parse(code_text)
+                self._parse_error = None
+            except (SyntaxError, ValueError, RecursionError, MemoryError) as e:
+                # ValueError: null bytes; RecursionError/MemoryError: nesting too deep for the parser
+                self._tree = None
+                self._parse_error = str(e)
+            self._parsed_code = code_text
+        return self._tree
+
+    def _scan_source(self, code_text: str, want_year: bool = True) -> Tuple[bool, Optional[str]]:
+        """
+        Returns (has_py2, earliest_year).
+        Each PY2 pattern only runs when its literal occurs in the text, so a typical
+        Python 3 source costs a few substring searches instead of a regex pass.
+        """
+        has_py2 = any(
+            literal in code_text and regex.search(code_text) is not None
+            for literal, regex in self._PY2_CHECKS
+        )
+        min_year = None
+        if want_year:
+            years = self._YEAR_RE.findall(code_text)
+            if years:
+                min_year = min(years)
+        return has_py2, min_year
 
     def _extract_imports_regex(self, code_text: str) -> set:
         """Fallback method to extract imports using regex."""
-        libraries = set()
-        import_pattern = r'^\s*import\s+([a-zA-Z_][a-zA-Z0-9_]*)'
-        from_pattern = r'^\s*from\s+([a-zA-Z_][a-zA-Z0-9_]*)\s+import'
-        
-        for line in code_text.split('\n'):
-            match = re.match(import_pattern, line)
-            if match:
-                libraries.add(match.group(1))
-            match_from = re.match(from_pattern, line)
-            if match_from:
-                libraries.add(match_from.group(1))
+        libraries = set(map(sys.intern, self._IMPORT_RE.findall(code_text)))
+        libraries.update(map(sys.intern, self._FROM_RE.findall(code_text)))
         return libraries
 
     def summary(self, code_text: str) -> Dict[str, any]:
@@ -160,9 +299,17 @@ class CodeAnalyzer:
 # Convenience function kept for compatibility
 def analyze_code_file(filepath: str) -> Dict[str, any]:
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            code_text = f.read()
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                # Decode straight from the page cache, skipping the text-mode reader
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    code_text = str(mm, 'utf-8')
+            else:
+                code_text = ''
     except Exception as e:
         raise IOError(f"Error reading file {filepath}: {e}")
+    if '\r' in code_text:
+        # Same universal-newline translation text mode used to apply
+        code_text = code_text.replace('\r\n', '\n').replace('\r', '\n')
     analyzer = CodeAnalyzer()
     return analyzer.summary(code_text)
@@ -3,14 +3,73 @@
 # Released under the MIT license
 # https://opensource.org/licenses/MIT
 
+import functools
 import json
+import logging
 import os
 import sys
-import tempfile
+from collections import deque
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 from .types import ExecutionHistory
-from lcr.utils.path_helper import get_user_data_path, get_log_path
+from lcr.utils.path_helper import get_user_data_path, get_log_path, dir_contains_any
+
+try:
+    # Optional fast JSON codec; the stdlib json module is the fallback
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dump_line(record) -> bytes:
+    """Serialize one record as a UTF-8 JSON Lines entry."""
+    if orjson is not None:
+        return orjson.dumps(record) + b'\n'
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+# Both accept UTF-8 bytes; orjson.JSONDecodeError subclasses json.JSONDecodeError
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+@functools.lru_cache(maxsize=1)
+def _find_project_root() -> Path:
+    """Find project root (folder containing src). Invariant per process, so computed once."""
+    # Heuristic: go up until we find 'src' folder or 'run_gui.py'
+    # Starting from this file: src/lcr/core/history/manager.py
+    current = Path(__file__).resolve().parent
+    for _ in range(5):
+        if dir_contains_any(current, ("src", "run_gui.py")):
+            return current
+        current = current.parent
+    return Path.cwd() # Fallback
+
+
+@functools.lru_cache(maxsize=1)
+def _debug_logger() -> logging.Logger:
+    """
+    Logger appending to lcr_debug.log. The file is opened on the first error
+    and then kept open, instead of being reopened for every message.
+    """
+    logger = logging.getLogger('lcr.history')
+    logger.propagate = False  # _log_error prints to stderr itself
+    # Plain FileHandler, not rotating: in frozen mode run_gui.py holds the same file open
+    handler = logging.FileHandler(get_log_path('lcr_debug.log'), encoding='utf-8', delay=True)
+    handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+    logger.addHandler(handler)
+    return logger
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist a rename in directory (POSIX only; Windows cannot open directories)."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
 
 class HistoryManager:
     """
@@ -18,23 +77,31 @@ class HistoryManager:
     Ensures portability by storing paths relative to the project root.
     
     Compatible with both development and PyInstaller frozen modes.
-    Uses atomic writes to prevent data corruption.
+    Records are stored as JSON Lines (one record per line) and saved by
+    appending, so a save costs the same regardless of history size.
     """
 
+    # Initial guess of bytes per stored record when reading the file tail
+    TAIL_BYTES_PER_RECORD = 512
+
     def __init__(self, storage_path: Optional[str] = None):
         """
         Args:
-            storage_path: Path to the JSON file. Defaults to data/history.json (uses path_helper).
+            storage_path: Path to the JSON Lines file. Defaults to data/history.jsonl (uses path_helper).
         """
         if storage_path:
             self.storage_path = Path(storage_path).resolve()
         else:
-            # CRITICAL FIX: Use 'data/history.json' NOT 'src/data/history.json'
-            # This ensures correct paths in both dev (c:/dev/lcr/data/history.json)
-            # and frozen modes (dist/LCR/data/history.json)
-            self.storage_path = get_user_data_path('data/history.json')
+            # CRITICAL FIX: Use 'data/history.jsonl' NOT 'src/data/history.jsonl'
+            # This ensures correct paths in both dev (c:/dev/lcr/data/history.jsonl)
+            # and frozen modes (dist/LCR/data/history.jsonl)
+            self.storage_path = get_user_data_path('data/history.jsonl')
             
-        self.project_root = self._find_project_root()
+        self.project_root = _find_project_root()
+        
+        # In-memory history and the (mtime_ns, size) of the file it mirrors
+        self._records: Optional[List[ExecutionHistory]] = None
+        self._records_stamp: Optional[Tuple[int, int]] = None
         
         # Self-Healing: Ensure directory and file exist
         self._ensure_storage_ready()
@@ -43,102 +110,268 @@ class HistoryManager:
         print(f"[HistoryManager] Storage Path: {self.storage_path}")
         print(f"[HistoryManager] Project Root: {self.project_root}")
 
-    def _find_project_root(self) -> Path:
-        """Find project root (folder containing src)."""
-        # Heuristic: go up until we find 'src' folder or 'run_gui.py'
-        # Starting from this file: src/lcr/core/history/manager.py
-        current = Path(__file__).resolve().parent
-        for _ in range(5):
-            if (current / "src").exists() or (current / "run_gui.py").exists():
-                return current
-            current = current.parent
-        return Path.cwd() # Fallback
-    
+    @property
+    def project_root(self) -> Path:
+        return self._project_root
+
+    @project_root.setter
+    def project_root(self, value) -> None:
+        self._project_root = Path(value)
+        # "root + separator" prefix for the string fast path in _to_relative
+        self._project_root_prefix = os.path.join(str(self._project_root), '')
+
     def _ensure_storage_ready(self) -> None:
         """
         Self-Healing: Create directory and empty history file if missing.
+        Migrates a legacy JSON array history (history.json) to JSON Lines once.
         """
         try:
             # Create data/ directory if it doesn't exist
             self.storage_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Create empty history.json if it doesn't exist
             if not self.storage_path.exists():
-                with open(self.storage_path, 'w', encoding='utf-8') as f:
-                    json.dump([], f, ensure_ascii=False)
-                print(f"[HistoryManager] Created new history file: {self.storage_path}")
+                legacy_path = self.storage_path.with_suffix('.json')
+                if legacy_path != self.storage_path and legacy_path.exists():
+                    self._migrate_legacy(legacy_path)
+                else:
+                    # Create empty history file
+                    self.storage_path.touch()
+                    print(f"[HistoryManager] Created new history file: {self.storage_path}")
+            elif self._is_legacy_format(self.storage_path):
+                self._migrate_legacy(self.storage_path)
         except Exception as e:
             self._log_error(f"Failed to initialize storage: {e}")
 
+    @staticmethod
+    def _is_legacy_format(path: Path) -> bool:
+        """A legacy history file holds a single JSON array instead of one record per line."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read(64).lstrip().startswith('[')
+
+    def _migrate_legacy(self, legacy_path: Path) -> None:
+        """Rewrite a legacy JSON array history as JSON Lines at storage_path."""
+        with open(legacy_path, 'rb') as f:
+            records = _loads(f.read())
+        
+        self._atomic_write(b''.join(map(_dump_line, records)))
+        print(f"[HistoryManager] Migrated {len(records)} records from {legacy_path}")
+
+    def _atomic_write(self, payload: bytes) -> None:
+        """
+        Replace the history file with payload.
+        The payload is serialized up front, so the temp file gets one write() call.
+        """
+        # ATOMIC WRITE: Write to temporary file first, then replace
+        temp_fd, temp_path = self._create_temp_file()
+        try:
+            with open(temp_fd, 'wb') as f:
+                f.write(payload)
+                # Data must be on disk before the rename can point at it
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.storage_path)
+            _fsync_dir(self.storage_path.parent)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def _create_temp_file(self) -> Tuple[int, str]:
+        """
+        Create the temp file for _atomic_write next to the history file.
+        Both paths are created inside the history file's directory, so the temp file
+        is always on the same filesystem and os.replace stays an atomic rename.
+        """
+        import tempfile  # Only needed for the rare full rewrite; kept off the import path
+        
+        directory = self.storage_path.parent
+        try:
+            temp_fd, temp_path = tempfile.mkstemp(
+                dir=directory,
+                prefix='.history_temp_',
+                suffix='.jsonl'
+            )
+        except OSError:
+            if os.name != 'nt':
+                raise
+            # Windows: fall back to a fixed sibling name (e.g. when an AV scanner blocks mkstemp)
+            temp_path = str(self.storage_path.with_suffix(self.storage_path.suffix + '.tmp'))
+            temp_fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0))
+        return temp_fd, temp_path
+
     def load_history(self) -> List[ExecutionHistory]:
         """
         Load history records with UTF-8 encoding.
+        The file is only re-read when its mtime/size changed since the last read,
+        so edits by another process are still picked up.
         """
-        if not self.storage_path.exists():
+        stamp = self._file_stamp()
+        if stamp is None:
+            self._records = None
             return []
         
+        if self._records is None or stamp != self._records_stamp:
+            self._records = self._read_from_disk()
+            self._records_stamp = stamp
+        # Callers get their own list; the cache stays append-only
+        return list(self._records)
+
+    def load_recent(self, limit: int) -> List[ExecutionHistory]:
+        """
+        Load only the newest `limit` records (the file is kept in save order).
+        Reads backwards from the end of the file, so the cost follows `limit`
+        rather than the size of the whole history.
+        """
+        if limit <= 0:
+            return []
+        stamp = self._file_stamp()
+        if stamp is None:
+            return []
+        if self._records is not None and stamp == self._records_stamp:
+            return self._records[-limit:]
+        
+        records = []
+        try:
+            with open(self.storage_path, 'rb') as f:
+                size = stamp[1]
+                window = limit * self.TAIL_BYTES_PER_RECORD
+                while True:
+                    start = max(0, size - window)
+                    f.seek(start)
+                    if start:
+                        f.readline()  # Discard the partial line we landed in
+                    lines = deque((line for line in f if line.strip()), maxlen=limit)
+                    if len(lines) >= limit or start == 0:
+                        break
+                    window *= 4  # Records were larger than estimated; widen the tail
+            for line in lines:
+                try:
+                    records.append(ExecutionHistory.from_dict(_loads(line)))
+                except (ValueError, TypeError) as e:  # JSONDecodeError is a ValueError
+                    self._log_error(f"Skipping corrupt history line: {e}")
+        except IOError as e:
+            self._log_error(f"Failed to load history: {e}")
+        return records
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the history file, or None if it is missing."""
         try:
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            st = os.stat(self.storage_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read_from_disk(self) -> List[ExecutionHistory]:
+        """
+        Parse every record in the history file.
+        Unreadable lines (e.g. a save cut short by a crash) are skipped.
+        """
+        try:
+            # One sized read, then split in C, instead of buffered per-line reads
+            with open(self.storage_path, 'rb') as f:
+                data = f.read()
+        except IOError as e:
             self._log_error(f"Failed to load history: {e}")
             return []
+        
+        records = []
+        for line_no, line in enumerate(data.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                records.append(ExecutionHistory.from_dict(_loads(line)))
+            except (ValueError, TypeError) as e:  # JSONDecodeError is a ValueError
+                self._log_error(f"Skipping corrupt history line {line_no}: {e}")
+        return records
+
+    def save_record(self, record: ExecutionHistory) -> Optional[ExecutionHistory]:
+        """
+        Save a new execution record by appending one line to the history file.
+        Converts absolute paths to relative paths before saving.
+        The line is written with a single write() call, so earlier records are never touched.
+        Returns the record as stored (relative paths), or None if saving failed.
+        """
+        saved = self.save_records([record])
+        return saved[0] if saved else None
 
-    def save_record(self, record: ExecutionHistory) -> None:
+    def save_records(self, records: Iterable[ExecutionHistory]) -> Optional[List[ExecutionHistory]]:
         """
-        Save a new execution record using atomic writes.
+        Save several execution records with one append (one open, one write()).
         Converts absolute paths to relative paths before saving.
-        Uses temporary file + os.replace() to prevent corruption.
+        Returns the records as stored, or None if saving failed (the error is logged).
         """
+        records = list(records)
+        if not records:
+            return []
         try:
-            history = self.load_history()
-            
             # Portable Path Conversion
-            portable_record = record.copy()
-            portable_record['script_path'] = self._to_relative(record['script_path'])
-            portable_record['output_dir'] = self._to_relative(record['output_dir'])
+            rows = [r.to_dict() if isinstance(r, ExecutionHistory) else r for r in records]
+            portable_records = [
+                {
+                    **row,
+                    'script_path': self._to_relative(row['script_path']),
+                    'output_dir': self._to_relative(row['output_dir']),
+                }
+                for row in rows
+            ]
             
-            history.append(portable_record)
-            
-            # Ensure directory exists
-            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # ATOMIC WRITE: Write to temporary file first, then replace
-            # This prevents corruption if app crashes during save
-            temp_fd, temp_path = tempfile.mkstemp(
-                dir=self.storage_path.parent,
-                prefix='.history_temp_',
-                suffix='.json',
-                text=True
-            )
+            # The cache can only be extended if nothing else wrote since it was read
+            cache_current = self._records is not None and self._file_stamp() == self._records_stamp
             
+            data = b''.join(map(_dump_line, portable_records))
+            written = [ExecutionHistory.from_dict(r) for r in portable_records]
             try:
-                with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
-                    json.dump(history, f, indent=2, ensure_ascii=False)
-                
-                # Atomic replace (overwrites target if exists)
-                os.replace(temp_path, self.storage_path)
-                
-                print(f"[HistoryManager] Record saved successfully ({len(history)} total entries)")
-                
-            except Exception as e:
-                # Clean up temp file if save failed
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
-                raise e
+                f = open(self.storage_path, 'ab+')
+            except FileNotFoundError:
+                # _ensure_storage_ready created data/ at startup; only recreate it if it was removed since
+                self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+                f = open(self.storage_path, 'ab+')
+            with f:
+                # Start on a fresh line if an earlier save was cut short mid-line
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        data = b'\n' + data
+                f.write(data)
+            
+            saved = "Record" if len(portable_records) == 1 else f"{len(portable_records)} records"
+            if cache_current:
+                self._records.extend(written)
+                self._records_stamp = self._file_stamp()
+                print(f"[HistoryManager] {saved} saved successfully ({len(self._records)} total entries)")
+            else:
+                self._records = None
+                print(f"[HistoryManager] {saved} saved successfully")
+            return written
                 
         except Exception as e:
             self._log_error(
                 f"Failed to save history record:\n"
                 f"  Path: {self.storage_path}\n"
                 f"  Error: {e}\n"
-                f"  Record: {record}"
+                f"  Record: {records[0] if len(records) == 1 else records}"
             )
+            return None
+
+    def export_pretty(self, path: str) -> None:
+        """
+        Write the whole history as an indented JSON array (human-readable export).
+        The history file itself stays compact JSON Lines.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([r.to_dict() for r in self.load_history()], f, indent=2, ensure_ascii=False)
 
     def _to_relative(self, path_str: str) -> str:
         """Convert absolute path to relative if within project root."""
+        # Fast path: an already-normalized path under the root needs no resolve() syscalls
+        prefix = self._project_root_prefix
+        if path_str.startswith(prefix):
+            rest = path_str[len(prefix):]
+            if rest and not os.path.isabs(rest) and os.path.normpath(rest) == rest:
+                return rest
+        
         try:
             p = Path(path_str).resolve()
             return str(p.relative_to(self.project_root))
@@ -165,11 +398,7 @@ class HistoryManager:
         
         # Log to lcr_debug.log for frozen mode
         try:
-            log_path = get_log_path('lcr_debug.log')
-            with open(log_path, 'a', encoding='utf-8') as f:
-                import datetime
-                timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"[{timestamp}] {error_msg}\n")
+            _debug_logger().error(error_msg)
         except Exception:
             # Don't let logging failures break the app
             pass
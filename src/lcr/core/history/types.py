@@ -1,14 +1,30 @@
-from typing import TypedDict, Optional
+from typing import Dict, Mapping
+from dataclasses import dataclass
+from lcr.utils.key_access import KeyAccessMixin
 
-class ExecutionHistory(TypedDict):
+@dataclass(slots=True, frozen=True)
+class ExecutionHistory(KeyAccessMixin):
     """
     Represents a single execution record.
     Paths should be stored as relative paths to project root for portability.
+    Slotted (far smaller than a dict per loaded record); record['key'] and
+    record.get('key') still work, and plain dicts are accepted when saving.
+    Frozen, since loaded records are shared through HistoryManager's cache.
     """
-    id: str           # UUID
-    timestamp: str    # ISO format or YYYYMMDD_HHMMSS
-    script_path: str  # Relative path to script
-    runtime_name: str # e.g. "Python 2.7 + OpenCV"
-    image_tag: str    # e.g. lcr-py27-cv-apt
-    output_dir: str   # Relative path to output directory
-    status: str       # success, failed, etc.
+    id: str = ""           # UUID
+    timestamp: str = ""    # ISO format or YYYYMMDD_HHMMSS
+    script_path: str = ""  # Relative path to script
+    runtime_name: str = "" # e.g. "Python 2.7 + OpenCV"
+    image_tag: str = ""    # e.g. lcr-py27-cv-apt
+    output_dir: str = ""   # Relative path to output directory
+    status: str = ""       # success, failed, etc.
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "ExecutionHistory":
+        """Build a record from stored JSON, ignoring keys this version does not know."""
+        if not isinstance(data, Mapping):
+            raise TypeError(f"history record must be a JSON object, got {type(data).__name__}")
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+    def to_dict(self) -> Dict[str, str]:
+        return {name: getattr(self, name) for name in self.__slots__}
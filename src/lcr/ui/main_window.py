@@ -14,16 +14,16 @@ from pathlib import Path
 import io
 import subprocess
 import datetime
-from pathlib import Path
+import uuid
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
     QLabel, QPushButton, QLineEdit, QPlainTextEdit, QTextEdit,
     QGroupBox, QFileDialog, QMessageBox, QApplication, QTabWidget,
-    QScrollArea, QTableWidget, QTableWidgetItem, QHeaderView, QListWidget, QListWidgetItem
+    QScrollArea, QTableWidget, QTableWidgetItem, QHeaderView, QListView, QListWidget, QListWidgetItem
 )
-from PySide6.QtGui import QFont, QColor, QPixmap, QDesktopServices
-from PySide6.QtCore import Qt, Slot, QUrl
+from PySide6.QtGui import QFont, QColor, QPixmap, QDesktopServices, QTextCursor, QTextBlockFormat, QTextCharFormat
+from PySide6.QtCore import Qt, Slot, QUrl, QTimer
 
 from lcr.core.detector.analyzer import CodeAnalyzer
 from lcr.core.container.manager import ContainerManager
@@ -32,10 +32,18 @@ from lcr.core.history.manager import HistoryManager
 from lcr.core.history.types import ExecutionHistory
 from utils.count_loc import count_lines_python
 
+# Foreground for non-successful history entries (shared, not rebuilt per row)
+_FAILED_FG = QColor(255, 0, 0)
+
 
 class MainWindow(QMainWindow):
     """Main window of the application."""
 
+    # Newest history records shown in the History tab
+    HISTORY_DISPLAY_LIMIT = 500
+    # Worker output is collected and written to the console at most this often (ms)
+    LOG_FLUSH_INTERVAL_MS = 50
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Legacy Code Reviver")
@@ -48,6 +56,13 @@ class MainWindow(QMainWindow):
         self.worker = None
         self.current_output_dir = None
 
+        # Console output buffer, flushed by a single-shot timer
+        self._log_buffer = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(self.LOG_FLUSH_INTERVAL_MS)
+        self._log_timer.timeout.connect(self._flush_worker_output)
+
         # setup UI
         self._setup_ui()
 
@@ -187,6 +202,10 @@ class MainWindow(QMainWindow):
         
         self.history_list = QListWidget()
         self.history_list.setAlternatingRowColors(True)
+        # Single-line rows: skip per-row size hints and lay out in batches
+        self.history_list.setUniformItemSizes(True)
+        self.history_list.setLayoutMode(QListView.Batched)
+        self.history_list.setBatchSize(64)
         self.history_list.itemDoubleClicked.connect(self._on_history_double_clicked)
         history_layout.addWidget(self.history_list)
         
@@ -196,8 +215,8 @@ class MainWindow(QMainWindow):
         
         self.tabs.addTab(self.history_tab, "History")
         
-        # Initial Load
-        self._refresh_history_list()
+        # Initial Load (after the first paint, so reading history does not delay the window)
+        QTimer.singleShot(0, self._refresh_history_list)
         
         right_layout.addWidget(self.tabs)
 
@@ -346,11 +365,13 @@ class MainWindow(QMainWindow):
             if feature.validation_year:
                 reasons.append(f"Validation Year ({feature.validation_year}) detected")
             
-            matches = [t for t in selected_rule.get('triggers', []) if t in search_terms]
+            # One set of the terms serves both membership checks below
+            terms_set = set(search_terms)
+            matches = [t for t in selected_rule.triggers if t in terms_set]
             if matches:
                 reasons.append(f"Triggers {matches} detected")
-                
-            match_libs = set(selected_rule.get('libs', [])).intersection(set(search_terms))
+
+            match_libs = terms_set.intersection(selected_rule.libs)
             if match_libs:
                 reasons.append(f"Libraries {list(match_libs)} matched")
                 
@@ -374,7 +395,7 @@ class MainWindow(QMainWindow):
             
             self.console_log.append(f"Output Directory (Host): {self.current_output_dir}")
             self.console_log.append(f"\n[Environment Decision Engine]")
-            self.console_log.append(f"Selected Runtime: {selected_rule.get('name', config['image'])}")
+            self.console_log.append(f"Selected Runtime: {selected_rule.name or config['image']}")
             self.console_log.append(f"Reason: {reason_text}")
             self.console_log.append(f"Image Tag: {config['image']}")
             
@@ -397,23 +418,45 @@ class MainWindow(QMainWindow):
     def _stop_container(self):
         if self.worker and self.worker.isRunning():
             self.worker.stop()
+            self._flush_worker_output()
             self.console_log.append("\n[Stopping...] Request sent to container.")
             self.stop_btn.setEnabled(False)
 
     @Slot(str)
     def _on_worker_output(self, text):
-        self.console_log.append(text)
+        # Bursts of output become one append/scroll per flush interval
+        self._log_buffer.append(text)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    @Slot()
+    def _flush_worker_output(self):
+        """Write buffered worker output to the console as one plain-text insert."""
+        self._log_timer.stop()
+        if not self._log_buffer:
+            return
+        # Container output is never rich text: append() would render a batch whose
+        # first line looks like HTML (e.g. "<div>") as markup. Plain, default-format
+        # text also keeps it from inheriting the color of an earlier status line.
+        cursor = QTextCursor(self.console_log.document())
+        cursor.movePosition(QTextCursor.End)
+        if not self.console_log.document().isEmpty():
+            cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+        cursor.insertText("\n".join(self._log_buffer), QTextCharFormat())
+        self._log_buffer.clear()
         sb = self.console_log.verticalScrollBar()
         sb.setValue(sb.maximum())
 
     @Slot(str)
     def _on_worker_error(self, text):
+        self._flush_worker_output()
         self.console_log.append(f"<font color='red'>{text}</font>")
         sb = self.console_log.verticalScrollBar()
         sb.setValue(sb.maximum())
 
     @Slot(int)
     def _on_worker_finished(self, exit_code):
+        self._flush_worker_output()
         status_msg = "Success" if exit_code == 0 else f"Failed (Code {exit_code})"
         color = "lime" if exit_code == 0 else "red"
         self.console_log.append(f"\n<font color='{color}'>--- Execution Finished: {status_msg} ---</font>")
@@ -425,7 +468,6 @@ class MainWindow(QMainWindow):
         # Save History
         try:
             if self.current_output_dir: # Ensure we have context
-                import uuid
                 # Reconstruct context (ideally worker should pass this back, but we have UI state)
                 # Note: We rely on self.script_path_edit.text() assuming it hasn't changed.
                 # A safer way is to store the run context when starting the worker.
@@ -438,18 +480,22 @@ class MainWindow(QMainWindow):
                 # Actually, relying on UI state is risky if user changed it during run.
                 # But LCR is modal-ish (buttons disabled).
                 
-                record: ExecutionHistory = {
-                    "id": str(uuid.uuid4()),
-                    "timestamp": datetime.datetime.now().replace(microsecond=0).isoformat(),
-                    "script_path": self.script_path_edit.text(),
-                    "runtime_name": "Docker Container", # Simplified
-                    "image_tag": "unknown", # We didn't save this in self
-                    "output_dir": self.current_output_dir,
-                    "status": "success" if exit_code == 0 else "failed"
-                }
-                self.history_manager.save_record(record)
-                self._refresh_history_list()
-                self.console_log.append(f"[History] Record saved.")
+                record = ExecutionHistory(
+                    id=str(uuid.uuid4()),
+                    timestamp=datetime.datetime.now().replace(microsecond=0).isoformat(),
+                    script_path=self.script_path_edit.text(),
+                    runtime_name="Docker Container", # Simplified
+                    image_tag="unknown", # We didn't save this in self
+                    output_dir=self.current_output_dir,
+                    status="success" if exit_code == 0 else "failed"
+                )
+                saved = self.history_manager.save_record(record)
+                if saved is not None:
+                    # Show the stored (path-relativized) record without rebuilding the list
+                    self._prepend_history_item(saved)
+                    self.console_log.append(f"[History] Record saved.")
+                else:
+                    self.console_log.append("[History Error] Failed to save record (see lcr_debug.log).")
                 
         except Exception as e:
             self.console_log.append(f"[History Error] Failed to save record: {e}")
@@ -553,30 +599,50 @@ class MainWindow(QMainWindow):
 
     @Slot()
     def _refresh_history_list(self):
-        """Reload history from manager."""
-        self.history_list.clear()
-        records = self.history_manager.load_history()
+        """Reload the most recent history records from manager."""
+        records = self.history_manager.load_recent(self.HISTORY_DISPLAY_LIMIT)
         # Sort by timestamp descending
         records.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        
-        for rec in records:
-            ts = rec.get('timestamp', 'N/A')
-            status = rec.get('status', 'unknown')
-            script = Path(rec.get('script_path', 'unknown')).name
-            rt = rec.get('runtime_name', 'unknown')
-            
-            # Label: [2026-01-01 12:00] Success: script.py (Runtime)
-            label = f"[{ts}] {status}: {script} ({rt})"
-            item = QListWidgetItem(label)
-            
-            # Store full record in Data UserRole
-            item.setData(Qt.UserRole, rec)
-            
-            # Color code
-            if status != 'success':
-                item.setForeground(QColor("red"))
-                
-            self.history_list.addItem(item)
+
+        # Rebuild without per-item repaints/signals; one repaint at the end
+        history_list = self.history_list
+        history_list.setUpdatesEnabled(False)
+        history_list.blockSignals(True)
+        try:
+            history_list.clear()
+            for rec in records:
+                history_list.addItem(self._make_history_item(rec))
+        finally:
+            history_list.blockSignals(False)
+            history_list.setUpdatesEnabled(True)
+
+    def _prepend_history_item(self, rec):
+        """Insert one new record at the top, trimming the list to the display limit."""
+        history_list = self.history_list
+        history_list.insertItem(0, self._make_history_item(rec))
+        while history_list.count() > self.HISTORY_DISPLAY_LIMIT:
+            history_list.takeItem(history_list.count() - 1)
+
+    def _make_history_item(self, rec) -> QListWidgetItem:
+        """Build the list entry for one history record."""
+        # Missing fields load as "" (ExecutionHistory defaults)
+        ts = rec.timestamp or 'N/A'
+        status = rec.status or 'unknown'
+        script = Path(rec.script_path or 'unknown').name
+        rt = rec.runtime_name or 'unknown'
+
+        # Label: [2026-01-01 12:00] Success: script.py (Runtime)
+        label = f"[{ts}] {status}: {script} ({rt})"
+        item = QListWidgetItem(label)
+
+        # Store full record in Data UserRole
+        item.setData(Qt.UserRole, rec)
+
+        # Color code
+        if status != 'success':
+            item.setForeground(_FAILED_FG)
+
+        return item
 
     @Slot(QListWidgetItem)
     def _on_history_double_clicked(self, item):
@@ -0,0 +1,28 @@
+# Copyright (c) 2026 Yusoku Advisor Godo Kaisha (ゆうそくアドバイザー合同会社)
+# Released under the MIT license
+# https://opensource.org/licenses/MIT
+
+"""
+Dict-style access for slotted dataclasses that replaced plain dict records.
+"""
+
+
+class KeyAccessMixin:
+    """
+    Keeps obj['key'] / obj.get('key') / 'key' in obj working for code written against dicts.
+    Only dataclass fields count as keys, so method names are never returned as values.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        if key not in self.__dataclass_fields__:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__dataclass_fields__
@@ -19,6 +19,26 @@ def is_frozen():
     return getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS')
 
 
+def dir_contains_any(directory: Path, names) -> bool:
+    """
+    Check whether a directory has an entry with any of the given names.
+    
+    Uses one directory read instead of a stat per candidate name.
+    
+    Args:
+        directory: Directory to inspect.
+        names: Collection of entry names (files or folders) to look for.
+    
+    Returns:
+        True if at least one name exists, False otherwise (including unreadable dirs).
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return any(entry.name in names for entry in entries)
+    except OSError:
+        return False
+
+
 def get_resource_path(relative_path: str) -> Path:
     """
     Get absolute path to a resource file or directory.
@@ -67,20 +87,20 @@ def get_user_data_path(relative_path: str) -> Path:
     """
     Get absolute path to a user data file or directory.
     
-    User data includes writable files like history.json, results/, etc.
+    User data includes writable files like history.jsonl, results/, etc.
     These are stored next to the executable in frozen mode for portability.
     
     Args:
         relative_path: Path relative to the user data root.
-                      Example: 'data/history.json', 'data/results'
+                      Example: 'data/history.jsonl', 'data/results'
     
     Returns:
         Absolute Path object pointing to the user data location.
     
     Example:
-        >>> get_user_data_path('data/history.json')
-        # Frozen: C:/dist/LCR/data/history.json (next to LCR.exe)
-        # Dev: C:/dev/lcr/src/data/history.json
+        >>> get_user_data_path('data/history.jsonl')
+        # Frozen: C:/dist/LCR/data/history.jsonl (next to LCR.exe)
+        # Dev: C:/dev/lcr/src/data/history.jsonl
     """
     if is_frozen():
         # In frozen mode, use directory containing the executable
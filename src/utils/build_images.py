@@ -37,7 +37,7 @@ def build_images():
                     data = json.load(f)
                     tag = data.get('tag')
                     # Match generator's filename logic
-                    safe_tag = tag.replace("-", "_").replace(":", "_")
+                    safe_tag = generator.safe_tag_name(tag)
                     
                     # Assume generator output path relative to project root
                     rel_path = f"src/lcr/core/container/images/Dockerfile.{safe_tag}"
@@ -19,8 +19,6 @@ def count_lines_python(input_source) -> Tuple[int, int, int]:
     Accepts valid file path (Path/str) or io.BytesIO stream.
     Returns (total, code, comment).
     """
-    import io
-    
     total_lines = 0
     code_lines = 0
     comment_lines = 0
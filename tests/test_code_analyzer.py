@@ -0,0 +1,145 @@
+
+import unittest
+import ast
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from lcr.core.detector.analyzer import CodeAnalyzer, _ImportCollector
+
+# One Python 2 sample per CodeAnalyzer.PY2_PATTERNS entry, keyed by its literal
+PY2_SAMPLES = {
+    'print': 'print "hello"\n',
+    'except': 'try:\n    pass\nexcept ValueError, e:\n    pass\n',
+    'raise': 'raise ValueError, "bad value"\n',
+    'exec': 'exec "x = 1"\n',
+    '<>': 'if a <> b:\n    pass\n',
+    '`': 'x = `y`\n',
+    'coding': '# -*- coding: utf-8 -*-\nx = 1\n',
+}
+
+COLLECTOR_SAMPLE = """
+import os, os.path
+import numpy as np
+from sklearn.model_selection import KFold
+from . import sibling
+from .pkg import thing
+class A:
+    def f(self):
+        try:
+            import scipy.stats
+        except ImportError:
+            from cv2 import imread
+        return sklearn.grid_search.GridSearchCV
+rows = [m.cross_validation for m in models]
+lookup = {k: v.grid_search for k, v in items}
+"""
+
+class TestCodeAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        CodeAnalyzer.cache_clear()
+        self.analyzer = CodeAnalyzer()
+
+    def tearDown(self):
+        CodeAnalyzer.cache_clear()
+
+    def test_deeply_nested_expression(self):
+        """Test that a long chained expression does not exhaust the recursion limit."""
+        code = "import os\nx = " + "+".join(["a"] * 500) + "\nmodel.grid_search\n"
+
+        feature = self.analyzer.analyze(code)
+
+        self.assertEqual(feature.imports, ["os"])
+        self.assertEqual(feature.keywords, ["attr:grid_search"])
+        self.assertEqual(feature.version_hint, "3.x")
+
+    def test_too_deep_for_parser_is_unknown(self):
+        """Test that input too deeply nested for ast.parse is reported as unknown."""
+        code = "x = " + "+".join(["a"] * 5000) + "\n"
+
+        self.assertEqual(self.analyzer.analyze_version(code), "unknown")
+        self.assertEqual(self.analyzer.analyze(code).version_hint, "unknown")
+
+    def test_cache_hit_returns_isolated_copy(self):
+        """Test that mutating a returned feature does not leak into cached results."""
+        code = "import os\nmodel.grid_search\n"
+
+        first = self.analyzer.analyze(code)
+        first.imports.append("mutated")
+        first.keywords.clear()
+
+        second = CodeAnalyzer().analyze(code)
+        self.assertEqual(second.imports, ["os"])
+        self.assertEqual(second.keywords, ["attr:grid_search"])
+        self.assertIsNot(first, second)
+
+    def test_cache_clear(self):
+        """Test that cache_clear drops all memoized results."""
+        self.analyzer.analyze("import os\n")
+        self.assertEqual(len(CodeAnalyzer._feature_cache), 1)
+
+        CodeAnalyzer.cache_clear()
+
+        self.assertEqual(len(CodeAnalyzer._feature_cache), 0)
+        self.assertEqual(self.analyzer.analyze("import os\n").imports, ["os"])
+
+    def test_each_py2_pattern(self):
+        """Test that every PY2 check matches its sample and classifies it as 2.7."""
+        self.assertEqual(sorted(PY2_SAMPLES), sorted(literal for literal, _ in CodeAnalyzer._PY2_CHECKS))
+        for literal, regex in CodeAnalyzer._PY2_CHECKS:
+            with self.subTest(literal=literal):
+                code = PY2_SAMPLES[literal]
+                self.assertIn(literal, code)
+                self.assertIsNotNone(regex.search(code))
+                self.assertEqual(self.analyzer.analyze_version(code), "2.7")
+
+    def test_py3_code_has_no_py2_match(self):
+        """Test that ordinary Python 3 code is not classified as 2.7."""
+        code = 'print("value:", 2 != 3)\nraise ValueError("x")\nexec("y = 1")\n'
+
+        self.assertEqual(self.analyzer.analyze_version(code), "3.x")
+
+    def test_collector_matches_ast_walk(self):
+        """Test that the collector finds the same imports and keywords as a plain ast.walk."""
+        tree = ast.parse(COLLECTOR_SAMPLE)
+        expected_imports = set()
+        expected_keywords = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                expected_imports.update(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.module:
+                    expected_imports.add(node.module.split('.')[0])
+            elif isinstance(node, ast.Attribute):
+                if node.attr in ['grid_search', 'cross_validation']:
+                    expected_keywords.append(f"attr:{node.attr}")
+
+        collector = _ImportCollector()
+        collector.visit(tree)
+        self.assertEqual(collector.imports, expected_imports)
+        self.assertEqual(collector.keywords, expected_keywords)
+
+        # Statement-only mode finds the same imports
+        statements_only = _ImportCollector(collect_keywords=False)
+        statements_only.visit(tree)
+        self.assertEqual(statements_only.imports, expected_imports)
+        self.assertEqual(statements_only.keywords, [])
+
+        feature = self.analyzer.analyze(COLLECTOR_SAMPLE)
+        self.assertEqual(feature.imports, sorted(expected_imports))
+        self.assertEqual(feature.keywords, expected_keywords)
+
+    def test_unparsable_code_falls_back_to_regex_imports(self):
+        """Test that imports are still found when the code does not parse."""
+        code = "import cv2\nfrom numpy import array\nprint 'x'\n"
+
+        feature = self.analyzer.analyze(code)
+
+        self.assertEqual(feature.imports, ["cv2", "numpy"])
+        self.assertEqual(feature.version_hint, "2.7")
+
+if __name__ == '__main__':
+    unittest.main()
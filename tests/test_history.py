@@ -4,6 +4,7 @@ import sys
 import os
 import shutil
 import json
+import dataclasses
 from pathlib import Path
 
 # Add src to path
@@ -20,7 +21,7 @@ class TestHistoryManager(unittest.TestCase):
         if self.test_dir.exists():
             shutil.rmtree(self.test_dir)
         self.test_dir.mkdir(parents=True)
-        self.history_file = self.test_dir / "test_history.json"
+        self.history_file = self.test_dir / "test_history.jsonl"
         
         self.manager = HistoryManager(str(self.history_file))
         
@@ -38,7 +39,7 @@ class TestHistoryManager(unittest.TestCase):
         abs_script = (self.manager.project_root / "data/samples/test.py").resolve()
         abs_output = (self.manager.project_root / "data/results/run1").resolve()
         
-        record: ExecutionHistory = {
+        record = {
             "id": "123-456",
             "timestamp": "2026-01-01T12:00:00",
             "script_path": str(abs_script),
@@ -51,9 +52,9 @@ class TestHistoryManager(unittest.TestCase):
         # Save
         self.manager.save_record(record)
         
-        # Verify JSON content is relative
+        # Verify JSON Lines content is relative
         with open(self.history_file, 'r') as f:
-            data = json.load(f)
+            data = [json.loads(line) for line in f if line.strip()]
             saved_script = data[0]['script_path']
             # Expecting normalized separators
             expected_rel = str(Path("data/samples/test.py"))
@@ -74,7 +75,7 @@ class TestHistoryManager(unittest.TestCase):
         """Test that paths outside project root remain absolute."""
         outside_path = "C:/Outside/file.py" if os.name == 'nt' else "/tmp/file.py"
         
-        record: ExecutionHistory = {
+        record = {
              "id": "789",
              "timestamp": "2026",
              "script_path": outside_path,
@@ -89,5 +90,85 @@ class TestHistoryManager(unittest.TestCase):
         loaded = self.manager.load_history()[0]
         self.assertEqual(loaded['script_path'], outside_path)
 
+    def test_migrates_legacy_json_array(self):
+        """Test that a legacy history.json array is converted to JSON Lines once."""
+        legacy_file = self.test_dir / "legacy_history.json"
+        records = [
+            {"id": "1", "script_path": "a.py", "output_dir": "out/1", "status": "success"},
+            {"id": "2", "script_path": "b.py", "output_dir": "out/2", "status": "failed"},
+        ]
+        with open(legacy_file, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=2)
+        
+        manager = HistoryManager(str(legacy_file.with_suffix('.jsonl')))
+        
+        loaded = manager.load_history()
+        self.assertEqual([(r['id'], r['script_path'], r['status']) for r in loaded],
+                         [(r['id'], r['script_path'], r['status']) for r in records])
+        with open(manager.storage_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(f.read().splitlines()), 2)
+
+    def test_load_recent_returns_newest(self):
+        """Test that load_recent reads the newest records from the file tail."""
+        records = [
+            {"id": str(i), "script_path": "a.py", "output_dir": "out", "status": "success"}
+            for i in range(20)
+        ]
+        self.manager.save_records(records)
+        
+        fresh = HistoryManager(str(self.history_file))
+        fresh.TAIL_BYTES_PER_RECORD = 8  # Force the tail window to grow
+        self.assertEqual([r['id'] for r in fresh.load_recent(5)], ["15", "16", "17", "18", "19"])
+        self.assertEqual(len(fresh.load_recent(100)), 20)
+
+    def test_save_record_returns_stored_record(self):
+        """Test that save_record returns what was written, or None when saving fails."""
+        abs_script = (self.manager.project_root / "data/samples/test.py").resolve()
+        saved = self.manager.save_record(
+            ExecutionHistory(id="1", script_path=str(abs_script), output_dir="out", status="success")
+        )
+        self.assertEqual(Path(saved['script_path']).as_posix(), "data/samples/test.py")
+        
+        # Missing script_path: the error is logged and nothing is written
+        self.assertIsNone(self.manager.save_record({"id": "2", "output_dir": "out"}))
+        self.assertEqual([r['id'] for r in self.manager.load_history()], ["1"])
+
+    def test_saves_dataclass_records(self):
+        """Test that ExecutionHistory records save the same way as dicts."""
+        abs_script = (self.manager.project_root / "data/samples/test.py").resolve()
+        record = ExecutionHistory(
+            id="321",
+            timestamp="2026-01-01T12:00:00",
+            script_path=str(abs_script),
+            runtime_name="Test Runtime",
+            image_tag="test-image",
+            output_dir="out",
+            status="success"
+        )
+        
+        self.manager.save_record(record)
+        
+        loaded = self.manager.load_history()[0]
+        self.assertEqual(loaded['id'], "321")
+        self.assertEqual(Path(loaded['script_path']).as_posix(), "data/samples/test.py")
+
+    def test_loaded_records_are_frozen(self):
+        """Test that records shared through the cache cannot be mutated."""
+        self.manager.save_record({"id": "1", "script_path": "a.py", "output_dir": "out", "status": "success"})
+        
+        loaded = self.manager.load_history()[0]
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            loaded.status = "failed"
+        self.assertEqual(self.manager.load_history()[0]['status'], "success")
+
+    def test_skips_non_object_lines(self):
+        """Test that lines decoding to something other than an object are skipped."""
+        with open(self.history_file, 'w', encoding='utf-8') as f:
+            f.write('{"id": "1", "status": "success"}\n[]\n"abc"\n{"id": "2", "status": "failed"}\n')
+        
+        fresh = HistoryManager(str(self.history_file))
+        self.assertEqual([r['id'] for r in fresh.load_history()], ["1", "2"])
+        self.assertEqual([r['id'] for r in fresh.load_recent(10)], ["1", "2"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -65,15 +65,15 @@ def test_integration():
     record_id = str(uuid.uuid4())
     timestamp = datetime.datetime.now().isoformat()
     
-    record: ExecutionHistory = {
-        "id": record_id,
-        "timestamp": timestamp,
-        "script_path": str(script_path), # Absolute path provided
-        "runtime_name": "Test Runtime",
-        "image_tag": config['image'],
-        "output_dir": str(host_work_dir), # Absolute path provided
-        "status": "success"
-    }
+    record = ExecutionHistory(
+        id=record_id,
+        timestamp=timestamp,
+        script_path=str(script_path), # Absolute path provided
+        runtime_name="Test Runtime",
+        image_tag=config['image'],
+        output_dir=str(host_work_dir), # Absolute path provided
+        status="success"
+    )
     
     history_mgr.save_record(record)
     print("Record saved.")
@@ -83,7 +83,7 @@ def test_integration():
     print(f"Checking {json_path}...")
     
     with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+        data = [json.loads(line) for line in f if line.strip()]  # JSON Lines
         saved_record = next((r for r in data if r['id'] == record_id), None)
         
         if saved_record: